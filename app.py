@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
 from pathlib import Path
-import matplotlib.pyplot as plt
-import sqlite3  # Python's built-in SQL library
+import csv
+import altair as alt  # Vega-Lite charts, rendered in the browser
+import duckdb  # In-process columnar SQL engine
+import pyarrow as pa
+from pyarrow import csv as pacsv  # Multithreaded CSV reader for the large deliveries file
 
 
 # it creates  the wide layout as the default streamlit is centered
@@ -12,11 +15,88 @@ st.set_page_config(layout="wide")
 
 # --- DATABASE SETUP ---
 
+# Dismissals that are not credited to the bowler
+NON_BOWLER_DISMISSALS = ['run out', 'retired hurt', 'obstructing the field']
+
+
+def _build_selection_stats(matches_df, deliveries_df, batsman_col_name):
+    """
+    Pre-aggregates the stats behind every dropdown into dicts keyed by team,
+    batsman, bowler and team pair, so a new selection is a dictionary lookup.
+    """
+    # Batsmen: fours and sixes
+    runs = deliveries_df['batsman_runs']
+    fours = deliveries_df[runs == 4].groupby(batsman_col_name, observed=True).size()
+    sixes = deliveries_df[runs == 6].groupby(batsman_col_name, observed=True).size()
+    batsman_stats = pd.concat(
+        [fours.rename('fours'), sixes.rename('sixes')], axis=1
+    ).fillna(0).astype(int).to_dict('index')
+
+    # Bowlers: balls bowled and wickets per dismissal kind
+    balls = deliveries_df.groupby('bowler', observed=True).size()
+    wickets = deliveries_df[
+        deliveries_df['dismissal_kind'].notna()
+        & ~deliveries_df['dismissal_kind'].isin(NON_BOWLER_DISMISSALS)
+    ].groupby(['bowler', 'dismissal_kind'], observed=True).size().sort_values(ascending=False)
+
+    bowler_stats = {bowler: {'balls': int(n), 'wicket_types': {}} for bowler, n in balls.items()}
+    for (bowler, kind), n in wickets.items():
+        bowler_stats[bowler]['wicket_types'][kind] = int(n)
+
+    # Teams: matches played, wins and no results, counting both team1 and team2 appearances
+    teams = pd.concat([matches_df['team1'], matches_df['team2']], ignore_index=True).astype(object)
+    winners = pd.concat([matches_df['winner'], matches_df['winner']], ignore_index=True).astype(object)
+    appearances = pd.DataFrame({
+        'team': teams,
+        'won': winners == teams,
+        'no_result': winners.isna() | (winners == 'No Result'),
+    })
+    team_summary = appearances.groupby('team').agg(
+        total_matches=('won', 'size'), wins=('won', 'sum'), no_result=('no_result', 'sum')
+    ).astype(int)
+
+    # Teams: top 10 winning venues
+    venue_wins = (
+        matches_df.groupby(['winner', 'venue'], observed=True).size()
+        .rename('wins_at_venue').sort_values(ascending=False)
+        .groupby(level='winner', observed=True).head(10)
+    )
+    team_venues = {
+        team: venues.droplevel('winner').to_frame()
+        for team, venues in venue_wins.groupby(level='winner', observed=True)
+    }
+
+    team_stats = {
+        team: {**row, 'venues': team_venues.get(team, pd.DataFrame(columns=['wins_at_venue']))}
+        for team, row in team_summary.to_dict('index').items()
+    }
+
+    # Head-to-head: matches and wins per unordered team pair
+    team1 = matches_df['team1'].astype(object)
+    team2 = matches_df['team2'].astype(object)
+    pairs = pd.DataFrame({
+        'low': team1.where(team1 < team2, team2),
+        'high': team2.where(team1 < team2, team1),
+        'winner': matches_df['winner'].astype(object),
+    })
+    h2h_stats = {
+        pair: {'total_matches': int(n), 'wins': {}}
+        for pair, n in pairs.groupby(['low', 'high']).size().items()
+    }
+    for (low, high, winner), n in pairs.groupby(['low', 'high', 'winner']).size().items():
+        h2h_stats[(low, high)]['wins'][winner] = int(n)
+
+    return {'team': team_stats, 'batsman': batsman_stats, 'bowler': bowler_stats, 'h2h': h2h_stats}
+
+
 @st.cache_resource
 def setup_database():
     """
-    Loads data from CSVs into an in-memory SQLite database.
-    Returns a database connection object.
+    Loads data from CSVs into an in-memory DuckDB database and precomputes
+    everything the dashboard shows.
+    Returns the team, batsman and bowler dropdown lists and a dict of
+    statistics: league-wide aggregates under 'league', plus per-selection
+    lookups under 'team', 'batsman', 'bowler' and 'h2h'.
     """
     SCRIPT_DIR = Path(__file__).parent
 
@@ -24,11 +104,61 @@ def setup_database():
     DELIVERIES_FILE_PATH = SCRIPT_DIR / "deliveries.csv"
 
     try:
-        matches_df = pd.read_csv(MATCHES_FILE_PATH)
-        deliveries_df = pd.read_csv(DELIVERIES_FILE_PATH)
+        # Only load the columns the dashboard uses
+        matches_df = pd.read_csv(
+            MATCHES_FILE_PATH,
+            usecols=['id', 'date', 'player_of_match', 'team1', 'team2', 'winner', 'venue'],
+            dtype={
+                'id': 'int32',
+                'winner': 'category',
+                'team1': 'category',
+                'team2': 'category',
+                'venue': 'category',
+                'player_of_match': 'category',
+            }
+        )
+        # Older datasets name the column 'batsman', newer ones 'batter'
+        with open(DELIVERIES_FILE_PATH, newline='') as f:
+            deliveries_cols = next(csv.reader(f), [])
+        if "batter" in deliveries_cols:
+            batsman_col_name = "batter"
+        elif "batsman" in deliveries_cols:
+            batsman_col_name = "batsman"
+        else:
+            st.error("Could not find 'batter' or 'batsman' column in deliveries.csv.")
+            st.stop()
+
+        if "bowler" not in deliveries_cols:
+            st.error("Could not find 'bowler' column in deliveries.csv.")
+            st.stop()
 
-        # Convert 'date' column for proper sorting
-        matches_df['date'] = pd.to_datetime(matches_df['date']).dt.strftime('%Y-%m-%d')
+        # Player and dismissal names repeat across every delivery, so read them
+        # dictionary-encoded and hand them to pandas as categoricals
+        category = pa.dictionary(pa.int32(), pa.string())
+        deliveries_df = pacsv.read_csv(
+            DELIVERIES_FILE_PATH,
+            convert_options=pacsv.ConvertOptions(
+                # Treat empty and 'NA' cells in text columns as missing, like pd.read_csv does
+                strings_can_be_null=True,
+                include_columns=[batsman_col_name, 'bowler', 'batsman_runs', 'dismissal_kind'],
+                column_types={
+                    batsman_col_name: category,
+                    'bowler': category,
+                    'batsman_runs': pa.int8(),
+                    'dismissal_kind': category,
+                }
+            )
+        ).to_pandas(types_mapper=lambda t: None if pa.types.is_dictionary(t) else pd.ArrowDtype(t))
+
+        # Missing or unparseable dates become NaT rather than failing the whole load
+        matches_df['date'] = pd.to_datetime(matches_df['date'], errors='coerce')
+
+        # Derive the season year once here instead of parsing dates in SQL on every query.
+        # 'Int16' is nullable, so a NaT date gives a NULL season instead of raising.
+        matches_df['season'] = matches_df['date'].dt.year.astype('Int16')
+
+        # Store 'date' as an ISO string for proper sorting
+        matches_df['date'] = matches_df['date'].dt.strftime('%Y-%m-%d')
 
     except FileNotFoundError as e:
         st.error(
@@ -38,354 +168,282 @@ def setup_database():
         st.error(f"Error loading data: {e}")
         st.stop()
 
-    # Create an in-memory SQLite database
-    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    # Dropdown lists never change, so build them once here instead of on every rerun
+    teams_list = sorted(matches_df['team1'].dropna().unique().tolist())
+    batsmen_list = sorted(deliveries_df[batsman_col_name].dropna().unique().tolist())
+    bowler_list = sorted(deliveries_df['bowler'].dropna().unique().tolist())
 
-    # Load both DataFrames into SQL tables
-    matches_df.to_sql("matches", conn, if_exists="replace", index=False)
-    deliveries_df.to_sql("deliveries", conn, if_exists="replace", index=False)
+    # Create an in-memory DuckDB database; the with-block closes it even if a query fails
+    with duckdb.connect(":memory:") as conn:
+        # The connection is only used here during setup, so DuckDB can query
+        # both DataFrames in place instead of copying them into tables
+        conn.register("matches", matches_df)
+        conn.register("deliveries", deliveries_df)
 
-    return conn
+        # The league-wide aggregates don't depend on any selection, so compute them once as well
+        league_stats = {}
 
+        league_stats['total_matches'] = conn.execute(
+            "SELECT COUNT(DISTINCT id) FROM matches;"
+        ).fetchone()[0]
 
-@st.cache_data
-def run_query(query):
-    """
-    Runs a SQL query on the database and returns the result as a DataFrame.
-    """
-    return pd.read_sql_query(query, _conn)
+        league_stats['season_counts'] = conn.execute("""
+            SELECT 
+                season, 
+                COUNT(id) as matches_per_season 
+            FROM matches 
+            GROUP BY season 
+            ORDER BY season;
+        """).df().set_index("season")
+
+        league_stats['pom'] = conn.execute("""
+            SELECT 
+                CAST(player_of_match AS VARCHAR) as player_of_match, 
+                COUNT(*) as pom_count 
+            FROM matches 
+            WHERE player_of_match IS NOT NULL 
+            GROUP BY player_of_match 
+            ORDER BY pom_count DESC 
+            LIMIT 10;
+        """).df().set_index("player_of_match")
+
+    stats = {'league': league_stats, **_build_selection_stats(matches_df, deliveries_df, batsman_col_name)}
+
+    return teams_list, batsmen_list, bowler_list, stats
 
 
-# --- INITIALIZE CONNECTION ---
+# --- INITIALIZE DATA ---
 try:
-    _conn = setup_database()
+    teams_list, batsmen_list, bowler_list, stats = setup_database()
 except Exception as e:
     st.error(f"Failed to initialize database: {e}")
     st.stop()
 
-# --- HEADER ---
-st.title('🏏 Indian Premier League (IPL) Analysis')
-st.write("A dashboard to explore IPL match data using SQL queries.")
+# --- CHARTS ---
 
-# --- UI LAYOUT ---
-col1, col2 = st.columns(2, gap="large")
+def _pie(sizes, labels, colors=None):
+    """
+    Builds an Altair pie chart; the browser renders it, so no drawing happens on the server.
+    """
+    pie_df = pd.DataFrame({'label': labels, 'count': sizes})
+    color_scale = alt.Scale(domain=list(labels), range=list(colors)) if colors else alt.Undefined
+
+    return alt.Chart(pie_df).mark_arc().encode(
+        theta='count:Q',
+        color=alt.Color('label:N', title=None, scale=color_scale, sort=list(labels)),
+        tooltip=['label:N', 'count:Q', alt.Tooltip('percent:Q', format='.1%')]
+    ).transform_joinaggregate(
+        total='sum(count)'
+    ).transform_calculate(
+        percent='datum.count / datum.total'
+    )
 
-with col1:
-    # --- Using Tabs for better UI ---
-    tab1, tab2 = st.tabs(["📊 Overall League Stats", "🏏 Batsman Analysis"])
 
-    with tab1:
-        st.header("Overall League Statistics")
-
-        # 1. Total Matches Metric
-        ipl_matches_played = " SELECT COUNT(DISTINCT id) AS total_ipl FROM matches "
-        total_matched_df = run_query(ipl_matches_played)
-        total_matched = total_matched_df['total_ipl'].iloc[0]
-        st.metric("TOTAL MATCHES PLAYED:", total_matched)
-
-        # 2. Matches per Season
-        st.subheader("Matches Per Season")
-        season_query = """
-        SELECT 
-            STRFTIME('%Y', date) as season, 
-            COUNT(id) as matches_per_season 
-        FROM matches 
-        GROUP BY season 
-        ORDER BY season;
-        """
-        season_df = run_query(season_query).set_index("season")
-        st.bar_chart(season_df)
-
-        # 3. Top 10 Players
-        st.subheader("Top 10 'Player of the Match'")
-        pom_query = """
-        SELECT 
-            player_of_match, 
-            COUNT(*) as pom_count 
-        FROM matches 
-        WHERE player_of_match IS NOT NULL 
-        GROUP BY player_of_match 
-        ORDER BY pom_count DESC 
-        LIMIT 10;
-        """
-        pom_df = run_query(pom_query).set_index("player_of_match")
-        st.bar_chart(pom_df)
+# --- SEASON WINNERS DATA ---
+
+# --- Team names for better appeal ---
+season_data = [
+    {"Season": 2008, "Winner": "RR", "Runner-up": "CSK", "Player of Series": "Shane Watson",
+     "Purple Cap": "Sohail Tanvir", "Emerging Player": "Shreevats Goswami"},
+    {"Season": 2009, "Winner": "DEC", "Runner-up": "RCB", "Player of Series": "Adam Gilchrist",
+     "Purple Cap": "RP Singh", "Emerging Player": "Rohit Sharma"},
+    {"Season": 2010, "Winner": "CSK", "Runner-up": "MI", "Player of Series": "Sachin Tendulkar",
+     "Purple Cap": "Pragyan Ojha", "Emerging Player": "Saurabh Tiwary"},
+    {"Season": 2011, "Winner": "CSK", "Runner-up": "RCB", "Player of Series": "Chris Gayle",
+     "Purple Cap": "Lasith Malinga", "Emerging Player": "Iqbal Abdulla"},
+    {"Season": 2012, "Winner": "KKR", "Runner-up": "CSK", "Player of Series": "Sunil Narine",
+     "Purple Cap": "Morné Morkel", "Emerging Player": "Mandeep Singh"},
+    {"Season": 2013, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Shane Watson",
+     "Purple Cap": "Dwayne Bravo", "Emerging Player": "Sanju Samson"},
+    {"Season": 2014, "Winner": "KKR", "Runner-up": "KXIP", "Player of Series": "Glenn Maxwell",
+     "Purple Cap": "Mohit Sharma", "Emerging Player": "Axar Patel"},
+    {"Season": 2015, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Andre Russell",
+     "Purple Cap": "Dwayne Bravo", "Emerging Player": "Shreyas Iyer"},
+    {"Season": 2016, "Winner": "SRH", "Runner-up": "RCB", "Player of Series": "Virat Kohli",
+     "Purple Cap": "Bhuvneshwar Kumar", "Emerging Player": "Mustafizur Rahman"},
+    {"Season": 2017, "Winner": "MI", "Runner-up": "RPSG", "Player of Series": "Ben Stokes",
+     "Purple Cap": "Bhuvneshwar Kumar", "Emerging Player": "Basil Thampi"},
+    {"Season": 2018, "Winner": "CSK", "Runner-up": "SRH", "Player of Series": "Sunil Narine",
+     "Purple Cap": "Andrew Tye", "Emerging Player": "Rishabh Pant"},
+    {"Season": 2019, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Andre Russell",
+     "Purple Cap": "Imran Tahir", "Emerging Player": "Shubman Gill"},
+    {"Season": 2020, "Winner": "MI", "Runner-up": "DC", "Player of Series": "Jofra Archer",
+     "Purple Cap": "Kagiso Rabada", "Emerging Player": "Devdutt Padikkal"},
+    {"Season": 2021, "Winner": "CSK", "Runner-up": "KKR", "Player of Series": "Harshal Patel",
+     "Purple Cap": "Harshal Patel", "Emerging Player": "Ruturaj Gaikwad"},
+    {"Season": 2022, "Winner": "GT", "Runner-up": "RR", "Player of Series": "Jos Buttler",
+     "Purple Cap": "Yuzvendra Chahal", "Emerging Player": "Umran Malik"},
+    {"Season": 2023, "Winner": "CSK", "Runner-up": "GT", "Player of Series": "Shubman Gill",
+     "Purple Cap": "Mohammed Shami", "Emerging Player": "Yashasvi Jaiswal"},
+    {"Season": 2024, "Winner": "KKR", "Runner-up": "SRH", "Player of Series": "Sunil Narine",
+     "Purple Cap": "Harshal Patel", "Emerging Player": "Nitish Kumar Reddy"},
+]
 
-    with tab2:
-        st.header("Batsman Boundary Analysis")
-
-        # We will try 'batter' first, then 'batsman'
-        batsman_col_name = "batter"  # Default to 'batter'
-        batsmen_query = "SELECT DISTINCT batter FROM deliveries ORDER BY batter;"
-        try:
-            batsmen_list = run_query(batsmen_query)['batter'].tolist()
-        except pd.errors.DatabaseError:
-            try:
-                batsman_col_name = "batsman"  # Fallback to 'batsman'
-                batsmen_query = "SELECT DISTINCT batsman FROM deliveries ORDER BY batsman;"
-                batsmen_list = run_query(batsmen_query)['batsman'].tolist()
-            except Exception as e:
-                st.error("Could not find 'batter' or 'batsman' column in deliveries.csv.")
-                st.stop()
-
-        selected_batsman = st.selectbox('Select a Batsman', batsmen_list, key="batsman_select")
-
-        if selected_batsman:
-            boundary_query = f"""
-            SELECT 
-                SUM(CASE WHEN batsman_runs = 4 THEN 1 ELSE 0 END) as Fours,
-                SUM(CASE WHEN batsman_runs = 6 THEN 1 ELSE 0 END) as Sixes
-            FROM deliveries
-            WHERE {batsman_col_name} = '{selected_batsman}'; 
-            """
-            boundary_df = run_query(boundary_query)
-
-            fours = boundary_df['Fours'].iloc[0]
-            sixes = boundary_df['Sixes'].iloc[0]
-
-            st.subheader(f"Boundary Breakdown for {selected_batsman}")
-
-            # Display as metrics
-            b_col1, b_col2 = st.columns(2)
-            b_col1.metric("Total Fours (4s)", int(fours) if fours else 0)
-            b_col2.metric("Total Sixes (6s)", int(sixes) if sixes else 0)
-
-            # Display pie chart
-            if (fours and fours > 0) or (sixes and sixes > 0):
-                labels = 'Fours', 'Sixes'
-                sizes = [fours, sixes]
-                colors = ['#007bff', '#dc3545']  # Blue, Red
-
-                fig, ax = plt.subplots()
-                ax.pie(sizes, labels=labels, autopct='%1.1f%%',
-                       startangle=90, colors=colors)
-                ax.axis('equal')
-                st.pyplot(fig)
-            else:
-                st.write(f"{selected_batsman} has not hit any boundaries.")
 
-# --- INTERACTIVE SQL ANALYSIS (Column 2) ---
-with col2:
-    # --- Using Tabs for better UI ---
-    tab3, tab4 = st.tabs(["🚩 Team Performance", "⚾ Bowler Analysis"])
+@st.cache_resource
+def _season_table():
+    """
+    Builds the season winners table indexed by season, along with the list of seasons.
+    """
+    season_winners_df = pd.DataFrame(season_data).set_index('Season')
+    return season_winners_df, season_winners_df.index.tolist()
 
-    with tab3:
-        st.header('Team Performance Analysis')
-
-        # Get a list of all unique teams for the dropdown
-        teams_query = "SELECT DISTINCT team1 FROM matches ORDER BY team1;"
-        teams_list = run_query(teams_query)['team1'].tolist()
-
-        selected_team = st.selectbox('Select a Team to Analyze', teams_list, key="team_select")
-
-        if selected_team:
-            st.subheader(f"Analysis for {selected_team}")
-
-            # 1. Query for total matches played
-            matches_played_query = f"""
-            SELECT COUNT(*) AS total_matches
-            FROM matches
-            WHERE Team1 = '{selected_team}' OR Team2 = '{selected_team}';
-            """
-            matches_played_df = run_query(matches_played_query)
-            total_matches = matches_played_df['total_matches'].iloc[0]
-
-            # 2. Query for matches won
-            matches_won_query = f"""
-            SELECT COUNT(*) AS wins
-            FROM matches
-            WHERE Winner = '{selected_team}';
-            """
-            matches_won_df = run_query(matches_won_query)
-            total_wins = matches_won_df['wins'].iloc[0]
-
-            # 3. Query for matches with no result
-            no_result_query = f"""
-            SELECT COUNT(*) AS no_result
-            FROM matches
-            WHERE (Team1 = '{selected_team}' OR Team2 = '{selected_team}')
-            AND (winner IS NULL OR winner = 'No Result'); 
-            """
-            no_result_df = run_query(no_result_query)
-            total_no_result = no_result_df['no_result'].iloc[0]
-
-            # 4. Calculate Losses
-            total_losses = total_matches - total_wins - total_no_result
-
-            # Display Metrics in Columns
-            m_col1, m_col2, m_col3, m_col4 = st.columns(4)
-            m_col1.metric("Total Matches", total_matches)
-            m_col2.metric("Wins", total_wins)
-            m_col3.metric("Losses", total_losses)
-            m_col4.metric("No Result", total_no_result)
-
-            # Win/Loss Pie Chart
-            st.subheader("Win/Loss Breakdown")
-            if total_matches > 0:
-                labels = 'Wins', 'Losses', 'No Result'
-                sizes = [total_wins, total_losses, total_no_result]
-                colors = ['#4CAF50', '#F44336', '#9E9E9E']  # Green, Red, Gray
-
-                non_zero_sizes = []
-                non_zero_labels = []
-                non_zero_colors = []
-                for size, label, color in zip(sizes, labels, colors):
-                    if size > 0:
-                        non_zero_sizes.append(size)
-                        non_zero_labels.append(label)
-                        non_zero_colors.append(color)
-
-                if non_zero_sizes:
-                    fig, ax = plt.subplots()
-                    ax.pie(non_zero_sizes, labels=non_zero_labels, autopct='%1.1f%%',
-                           startangle=90, colors=non_zero_colors)
-                    ax.axis('equal')
-                    st.pyplot(fig)
-                else:
-                    st.write("No match data to display in pie chart.")
-            else:
-                st.write("No matches found for this team.")
 
-            # Top 10 Winning Venues
-            st.subheader(f"Top 10 Winning Venues for {selected_team}")
-            team_venue_query = f"""
-            SELECT 
-                venue, 
-                COUNT(*) as wins_at_venue
-            FROM matches
-            WHERE winner = '{selected_team}'
-            GROUP BY venue
-            ORDER BY wins_at_venue DESC
-            LIMIT 10;
-            """
-            team_venue_df = run_query(team_venue_query).set_index("venue")
+# --- UI SECTIONS ---
+# Each section is a fragment, so changing one of its widgets only reruns that section
 
-            if not team_venue_df.empty:
-                st.bar_chart(team_venue_df)
-            else:
-                st.write(f"{selected_team} has not registered any wins.")
+@st.fragment
+def render_overall_tab(league_stats):
+    st.header("Overall League Statistics")
 
-    with tab4:
-        st.header("Bowler Wicket Analysis")
-
-        # Get a list of all bowlers
-        bowler_query = "SELECT DISTINCT bowler FROM deliveries ORDER BY bowler;"
-        try:
-            bowler_list = run_query(bowler_query)['bowler'].tolist()
-        except Exception as e:
-            st.error(f"Could not find 'bowler' column in deliveries.csv: {e}")
-            st.stop()
+    # 1. Total Matches Metric
+    st.metric("TOTAL MATCHES PLAYED:", league_stats['total_matches'])
+
+    # 2. Matches per Season
+    st.subheader("Matches Per Season")
+    st.bar_chart(league_stats['season_counts'])
+
+    # 3. Top 10 Players
+    st.subheader("Top 10 'Player of the Match'")
+    st.bar_chart(league_stats['pom'])
+
+
+@st.fragment
+def render_batsman_tab(batsmen_list, batsman_stats):
+    st.header("Batsman Boundary Analysis")
+
+    selected_batsman = st.selectbox('Select a Batsman', batsmen_list, key="batsman_select")
+
+    if selected_batsman:
+        boundaries = batsman_stats.get(selected_batsman, {'fours': 0, 'sixes': 0})
+        fours = boundaries['fours']
+        sixes = boundaries['sixes']
+
+        st.subheader(f"Boundary Breakdown for {selected_batsman}")
 
-        selected_bowler = st.selectbox('Select a Bowler', bowler_list, key="bowler_select")
-
-        if selected_bowler:
-            # 1. Query for total wickets and total balls bowled
-            bowler_stats_query = f"""
-            SELECT
-                COUNT(CASE WHEN dismissal_kind IS NOT NULL AND dismissal_kind NOT IN ('run out', 'retired hurt', 'obstructing the field') THEN 1 ELSE NULL END) as total_wickets,
-                COUNT(*) as total_balls
-            FROM deliveries
-            WHERE bowler = '{selected_bowler}';
-            """
-            bowler_stats_df = run_query(bowler_stats_query)
-
-            total_wickets = bowler_stats_df['total_wickets'].iloc[0]
-            total_balls = bowler_stats_df['total_balls'].iloc[0]
-
-            # Calculate overs string (e.g., "10.5 overs")
-            overs_bowled_str = f"{total_balls // 6}.{total_balls % 6}"
-
-            # Display metrics
-            st.subheader(f"Career Stats for {selected_bowler}")
-            bw_col1, bw_col2 = st.columns(2)
-            bw_col1.metric("Total Wickets Taken", total_wickets)
-            bw_col2.metric("Total Overs Bowled", overs_bowled_str)
-
-            # 2. Query for wicket types (for the pie chart)
-            wicket_types_query = f"""
-            SELECT
-                dismissal_kind,
-                COUNT(*) as wicket_count
-            FROM deliveries
-            WHERE bowler = '{selected_bowler}'
-              AND dismissal_kind IS NOT NULL
-              AND dismissal_kind NOT IN ('run out', 'retired hurt', 'obstructing the field')
-            GROUP BY dismissal_kind
-            ORDER BY wicket_count DESC;
-            """
-            wicket_types_df = run_query(wicket_types_query)
-
-            st.subheader("Wicket Type Breakdown")
-
-            if not wicket_types_df.empty:
-                fig, ax = plt.subplots()
-                ax.pie(
-                    wicket_types_df['wicket_count'],
-                    labels=wicket_types_df['dismissal_kind'],
-                    autopct='%1.1f%%',
-                    startangle=90
-                )
-                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle.
-                st.pyplot(fig)
+        # Display as metrics
+        b_col1, b_col2 = st.columns(2)
+        b_col1.metric("Total Fours (4s)", fours)
+        b_col2.metric("Total Sixes (6s)", sixes)
+
+        # Display pie chart
+        if fours > 0 or sixes > 0:
+            labels = 'Fours', 'Sixes'
+            sizes = fours, sixes
+            colors = '#007bff', '#dc3545'  # Blue, Red
+
+            st.altair_chart(_pie(sizes, labels, colors), width="stretch")
+        else:
+            st.write(f"{selected_batsman} has not hit any boundaries.")
+
+
+@st.fragment
+def render_team_tab(teams_list, team_stats):
+    st.header('Team Performance Analysis')
+
+    selected_team = st.selectbox('Select a Team to Analyze', teams_list, key="team_select")
+
+    if selected_team:
+        st.subheader(f"Analysis for {selected_team}")
+
+        # 1. Look up total matches played, matches won and matches with no result
+        team_info = team_stats[selected_team]
+        total_matches = team_info['total_matches']
+        total_wins = team_info['wins']
+        total_no_result = team_info['no_result']
+
+        # 2. Calculate Losses
+        total_losses = total_matches - total_wins - total_no_result
+
+        # Display Metrics in Columns
+        m_col1, m_col2, m_col3, m_col4 = st.columns(4)
+        m_col1.metric("Total Matches", total_matches)
+        m_col2.metric("Wins", total_wins)
+        m_col3.metric("Losses", total_losses)
+        m_col4.metric("No Result", total_no_result)
+
+        # Win/Loss Pie Chart
+        st.subheader("Win/Loss Breakdown")
+        if total_matches > 0:
+            labels = 'Wins', 'Losses', 'No Result'
+            sizes = [total_wins, total_losses, total_no_result]
+            colors = ['#4CAF50', '#F44336', '#9E9E9E']  # Green, Red, Gray
+
+            non_zero_sizes = []
+            non_zero_labels = []
+            non_zero_colors = []
+            for size, label, color in zip(sizes, labels, colors):
+                if size > 0:
+                    non_zero_sizes.append(size)
+                    non_zero_labels.append(label)
+                    non_zero_colors.append(color)
+
+            if non_zero_sizes:
+                st.altair_chart(_pie(non_zero_sizes, non_zero_labels, non_zero_colors), width="stretch")
             else:
-                st.write(f"{selected_bowler} has not taken any wickets.")
+                st.write("No match data to display in pie chart.")
+        else:
+            st.write("No matches found for this team.")
 
+        # Top 10 Winning Venues
+        st.subheader(f"Top 10 Winning Venues for {selected_team}")
+        team_venue_df = team_info['venues']
 
-# --- Using st.container(border=True) for better grouping ---
+        if not team_venue_df.empty:
+            st.bar_chart(team_venue_df)
+        else:
+            st.write(f"{selected_team} has not registered any wins.")
 
-with st.container(border=True):
+
+@st.fragment
+def render_bowler_tab(bowler_list, bowler_stats):
+    st.header("Bowler Wicket Analysis")
+
+    selected_bowler = st.selectbox('Select a Bowler', bowler_list, key="bowler_select")
+
+    if selected_bowler:
+        # 1. Look up balls bowled and wickets per dismissal kind (most frequent first)
+        bowler_info = bowler_stats[selected_bowler]
+        total_balls = bowler_info['balls']
+        wicket_types = bowler_info['wicket_types']
+        total_wickets = sum(wicket_types.values())
+
+        # Calculate overs string (e.g., "10.5 overs")
+        overs_bowled_str = f"{total_balls // 6}.{total_balls % 6}"
+
+        # Display metrics
+        st.subheader(f"Career Stats for {selected_bowler}")
+        bw_col1, bw_col2 = st.columns(2)
+        bw_col1.metric("Total Wickets Taken", total_wickets)
+        bw_col2.metric("Total Overs Bowled", overs_bowled_str)
+
+        st.subheader("Wicket Type Breakdown")
+
+        if wicket_types:
+            st.altair_chart(_pie(
+                list(wicket_types.values()),
+                list(wicket_types.keys())
+            ), width="stretch")
+        else:
+            st.write(f"{selected_bowler} has not taken any wickets.")
+
+
+@st.fragment
+def render_season_winners():
     st.header("🏆 Season-by-Season Winners")
 
-    # --- Team names for better appeal ---
-    season_data = [
-        {"Season": 2008, "Winner": "RR", "Runner-up": "CSK", "Player of Series": "Shane Watson",
-         "Purple Cap": "Sohail Tanvir", "Emerging Player": "Shreevats Goswami"},
-        {"Season": 2009, "Winner": "DEC", "Runner-up": "RCB", "Player of Series": "Adam Gilchrist",
-         "Purple Cap": "RP Singh", "Emerging Player": "Rohit Sharma"},
-        {"Season": 2010, "Winner": "CSK", "Runner-up": "MI", "Player of Series": "Sachin Tendulkar",
-         "Purple Cap": "Pragyan Ojha", "Emerging Player": "Saurabh Tiwary"},
-        {"Season": 2011, "Winner": "CSK", "Runner-up": "RCB", "Player of Series": "Chris Gayle",
-         "Purple Cap": "Lasith Malinga", "Emerging Player": "Iqbal Abdulla"},
-        {"Season": 2012, "Winner": "KKR", "Runner-up": "CSK", "Player of Series": "Sunil Narine",
-         "Purple Cap": "Morné Morkel", "Emerging Player": "Mandeep Singh"},
-        {"Season": 2013, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Shane Watson",
-         "Purple Cap": "Dwayne Bravo", "Emerging Player": "Sanju Samson"},
-        {"Season": 2014, "Winner": "KKR", "Runner-up": "KXIP", "Player of Series": "Glenn Maxwell",
-         "Purple Cap": "Mohit Sharma", "Emerging Player": "Axar Patel"},
-        {"Season": 2015, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Andre Russell",
-         "Purple Cap": "Dwayne Bravo", "Emerging Player": "Shreyas Iyer"},
-        {"Season": 2016, "Winner": "SRH", "Runner-up": "RCB", "Player of Series": "Virat Kohli",
-         "Purple Cap": "Bhuvneshwar Kumar", "Emerging Player": "Mustafizur Rahman"},
-        {"Season": 2017, "Winner": "MI", "Runner-up": "RPSG", "Player of Series": "Ben Stokes",
-         "Purple Cap": "Bhuvneshwar Kumar", "Emerging Player": "Basil Thampi"},
-        {"Season": 2018, "Winner": "CSK", "Runner-up": "SRH", "Player of Series": "Sunil Narine",
-         "Purple Cap": "Andrew Tye", "Emerging Player": "Rishabh Pant"},
-        {"Season": 2019, "Winner": "MI", "Runner-up": "CSK", "Player of Series": "Andre Russell",
-         "Purple Cap": "Imran Tahir", "Emerging Player": "Shubman Gill"},
-        {"Season": 2020, "Winner": "MI", "Runner-up": "DC", "Player of Series": "Jofra Archer",
-         "Purple Cap": "Kagiso Rabada", "Emerging Player": "Devdutt Padikkal"},
-        {"Season": 2021, "Winner": "CSK", "Runner-up": "KKR", "Player of Series": "Harshal Patel",
-         "Purple Cap": "Harshal Patel", "Emerging Player": "Ruturaj Gaikwad"},
-        {"Season": 2022, "Winner": "GT", "Runner-up": "RR", "Player of Series": "Jos Buttler",
-         "Purple Cap": "Yuzvendra Chahal", "Emerging Player": "Umran Malik"},
-        {"Season": 2023, "Winner": "CSK", "Runner-up": "GT", "Player of Series": "Shubman Gill",
-         "Purple Cap": "Mohammed Shami", "Emerging Player": "Yashasvi Jaiswal"},
-        {"Season": 2024, "Winner": "KKR", "Runner-up": "SRH", "Player of Series": "Sunil Narine",
-         "Purple Cap": "Harshal Patel", "Emerging Player": "Nitish Kumar Reddy"},
-    ]
-
-    season_winners_df = pd.DataFrame(season_data)
+    season_winners_df, seasons = _season_table()
 
     # Create a dropdown to select the season
     selected_season = st.selectbox(
         'Select a Season to see the winners',
-        season_winners_df['Season'].unique(),
-        index=len(season_winners_df['Season'].unique()) - 1  # Default to the most recent season
+        seasons,
+        index=len(seasons) - 1  # Default to the most recent season
     )
 
     if selected_season:
         # Get the data for the selected season
-        season_info = season_winners_df[season_winners_df['Season'] == selected_season].iloc[0]
+        season_info = season_winners_df.loc[selected_season]
 
         # Display the data in 5 columns
         s_col1, s_col2, s_col3, s_col4, s_col5 = st.columns(5)
@@ -396,8 +454,9 @@ with st.container(border=True):
         s_col4.metric("Purple Cap (Best Bowler)", season_info['Purple Cap'])
         s_col5.metric("Emerging Player", season_info['Emerging Player'])
 
-# --- MODIFIED: Using st.container(border=True) and showing metrics only ---
-with st.container(border=True, key="h2h_container"):
+
+@st.fragment
+def render_h2h(teams_list, h2h_stats):
     st.header("⚔️ Head-to-Head (H2H) Analysis")
 
 
@@ -408,39 +467,13 @@ with st.container(border=True, key="h2h_container"):
     if team_a and team_b and team_a != team_b:
         st.subheader(f"{team_a} vs. {team_b}")
 
-        # 1. Total H2H Matches
-        h2h_matches_query = f"""
-        SELECT COUNT(*) as total_matches
-        FROM matches
-        WHERE (team1 = '{team_a}' AND team2 = '{team_b}') 
-           OR (team1 = '{team_b}' AND team2 = '{team_a}');
-        """
-        h2h_matches_df = run_query(h2h_matches_query)
-        h2h_total = h2h_matches_df['total_matches'].iloc[0]
-
-        # 2. Team A Wins
-        team_a_wins_query = f"""
-        SELECT COUNT(*) as wins
-        FROM matches
-        WHERE winner = '{team_a}'
-          AND ((team1 = '{team_a}' AND team2 = '{team_b}') 
-               OR (team1 = '{team_b}' AND team2 = '{team_a}'));
-        """
-        team_a_wins_df = run_query(team_a_wins_query)
-        team_a_wins = team_a_wins_df['wins'].iloc[0]
-
-        # 3. Team B Wins
-        team_b_wins_query = f"""
-        SELECT COUNT(*) as wins
-        FROM matches
-        WHERE winner = '{team_b}'
-          AND ((team1 = '{team_a}' AND team2 = '{team_b}') 
-               OR (team1 = '{team_b}' AND team2 = '{team_a}'));
-        """
-        team_b_wins_df = run_query(team_b_wins_query)
-        team_b_wins = team_b_wins_df['wins'].iloc[0]
-
-        # 4. No Result
+        # 1. Total H2H Matches, Team A Wins and Team B Wins (pairs are keyed in sorted order)
+        h2h_info = h2h_stats.get(tuple(sorted((team_a, team_b))), {'total_matches': 0, 'wins': {}})
+        h2h_total = h2h_info['total_matches']
+        team_a_wins = h2h_info['wins'].get(team_a, 0)
+        team_b_wins = h2h_info['wins'].get(team_b, 0)
+
+        # 2. No Result
         h2h_no_result = h2h_total - team_a_wins - team_b_wins
 
         # Display H2H metrics
@@ -458,4 +491,43 @@ with st.container(border=True, key="h2h_container"):
             st.write("These two teams have not played against each other.")
 
     elif team_a == team_b:
-        st.warning("Please select two different teams for Head-to-Head analysis.")
\ No newline at end of file
+        st.warning("Please select two different teams for Head-to-Head analysis.")
+
+
+# --- HEADER ---
+st.title('🏏 Indian Premier League (IPL) Analysis')
+st.write("A dashboard to explore IPL match data using SQL queries.")
+
+# --- UI LAYOUT ---
+col1, col2 = st.columns(2, gap="large")
+
+with col1:
+    # --- Using Tabs for better UI ---
+    tab1, tab2 = st.tabs(["📊 Overall League Stats", "🏏 Batsman Analysis"])
+
+    with tab1:
+        render_overall_tab(stats['league'])
+
+    with tab2:
+        render_batsman_tab(batsmen_list, stats['batsman'])
+
+# --- INTERACTIVE SQL ANALYSIS (Column 2) ---
+with col2:
+    # --- Using Tabs for better UI ---
+    tab3, tab4 = st.tabs(["🚩 Team Performance", "⚾ Bowler Analysis"])
+
+    with tab3:
+        render_team_tab(teams_list, stats['team'])
+
+    with tab4:
+        render_bowler_tab(bowler_list, stats['bowler'])
+
+
+# --- Using st.container(border=True) for better grouping ---
+
+with st.container(border=True):
+    render_season_winners()
+
+# --- MODIFIED: Using st.container(border=True) and showing metrics only ---
+with st.container(border=True, key="h2h_container"):
+    render_h2h(teams_list, stats['h2h'])